@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 import time
 from typing import Optional, Union
@@ -62,6 +63,8 @@ Run segmentation/inference on selected images using one of the available pre-tra
         load_paths = []
         # List of image paths to pass to Nextflow
         img_paths = []
+        # Get the current layer names once, rather than searching the layer list per image
+        layer_names = {layer.name for layer in self.viewer.layers}
         for img_name, img_fpath in self.subwidgets[
             "data"
         ].image_path_dict.items():
@@ -69,7 +72,7 @@ Run segmentation/inference on selected images using one of the available pre-tra
                 img_name, executed=True
             )
             # Check if this mask has been imported already
-            if mask_layer_name in self.viewer.layers:
+            if mask_layer_name in layer_names:
                 masks_exist.append(True)
             # Check if the mask exists from a previous run to load in
             elif (
@@ -104,8 +107,9 @@ Run segmentation/inference on selected images using one of the available pre-tra
                 "nxf"
             ].mask_dir_path / self._get_mask_name(fpath.stem, executed=True)
             # If it does, load it
+            # Memory-mapped (copy-on-write) so it's only read in as it's viewed
             if mask_fpath.exists():
-                mask_data = np.load(mask_fpath, allow_pickle=True)
+                mask_data = np.load(mask_fpath, mmap_mode="c")
                 # Check if the mask layer already exists
                 if layer_name in self.viewer.layers:
                     # If so, update the data just to make sure & ensure visible
@@ -167,23 +171,33 @@ Run segmentation/inference on selected images using one of the available pre-tra
             self.watcher_enabled = True
             # Initialize empty container for storing mask filepaths
             self.mask_fpaths = []
+            mask_dir_path = self.subwidgets["nxf"].mask_dir_path
             # Loop and yield any changes infinitely while enabled
             while self.watcher_enabled:
-                # Get all files
-                current_files = list(
-                    self.subwidgets["nxf"].mask_dir_path.glob("*.npy")
-                )
-                # Filter out any _all files, can occur when process is too fast (i.e. single image)
-                current_files = [
-                    i for i in current_files if Path(i).stem[-4:] != "_all"
-                ]
-                # Filter out files we are not running on
-                current_files = [
-                    i
-                    for i in current_files
-                    if Path(i).stem.split("_masks_")[0]
-                    in self.subwidgets["data"].image_path_dict
-                ]
+                # Stream the directory once, filtering on the entry name before creating any Paths
+                # The mask dir can accumulate masks from many previous runs, so reject those early
+                current_files = []
+                # The pipeline may not have created the mask dir yet
+                try:
+                    entries = os.scandir(mask_dir_path)
+                except FileNotFoundError:
+                    entries = None
+                if entries is not None:
+                    with entries:
+                        for entry in entries:
+                            if not entry.name.endswith(".npy"):
+                                continue
+                            stem = entry.name[:-4]
+                            # Skip any _all files, can occur when process is too fast (i.e. single image)
+                            if stem.endswith("_all"):
+                                continue
+                            # Skip files we are not running on
+                            if (
+                                stem.split("_masks_")[0]
+                                not in self.subwidgets["data"].image_path_dict
+                            ):
+                                continue
+                            current_files.append(mask_dir_path / entry.name)
                 if set(self.mask_fpaths) != set(current_files):
                     # Get the new files only
                     new_files = [
@@ -330,18 +344,17 @@ Run segmentation/inference on selected images using one of the available pre-tra
             mask_layer_name = self._get_mask_layer_name(
                 img_name, executed=True
             )
+            mask_layer = self.viewer.layers[mask_layer_name]
             # Clear the current mask layer of data (to free up memory??)
-            self.viewer.layers[mask_layer_name].data = np.zeros_like(
-                self.viewer.layers[mask_layer_name].data
-            )
-            # Load the numpy array
+            mask_layer.data = np.zeros_like(mask_layer.data)
+            # Load the numpy array (memory-mapped, copy-on-write)
             mask_arr = np.load(
                 self.subwidgets["nxf"].mask_dir_path
                 / self._get_mask_name(
                     img_fpath.stem, executed=True, truncate=False
                 ),
-                allow_pickle=True,
+                mmap_mode="c",
             )
             # Insert mask data
-            self.viewer.layers[mask_layer_name].data = mask_arr
-            self.viewer.layers[mask_layer_name].visible = True
+            mask_layer.data = mask_arr
+            mask_layer.visible = True
@@ -1,4 +1,6 @@
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
 from pathlib import Path
 from typing import Optional, Union
 
@@ -14,10 +16,13 @@ from qtpy.QtWidgets import (
     QLabel,
     QFileDialog,
 )
-import skimage.io
 
 from ai_on_demand.widget_classes import SubWidget
-from ai_on_demand.utils import format_tooltip, get_image_layer_path
+from ai_on_demand.utils import (
+    format_tooltip,
+    get_image_layer_path,
+    read_image,
+)
 
 
 class DataWidget(SubWidget):
@@ -175,7 +180,11 @@ Images can also be opened, or dragged into napari as normal. The selection will
             self, caption="Select image directory", directory=None
         )
         if result != "":
-            all_paths = list(Path(result).glob("*"))
+            # Only take files (not subdirectories), kept as strings to avoid creating a Path for every entry
+            with os.scandir(result) as entries:
+                all_paths = [
+                    entry.path for entry in entries if entry.is_file()
+                ]
             self.update_file_count(paths=all_paths)
             self.view_images(imgs_to_load=all_paths)
 
@@ -192,11 +201,11 @@ Images can also be opened, or dragged into napari as normal. The selection will
             return
         if imgs_to_load is None:
             # Check if there are images to load that haven't been already
-            viewer_imgs = [
+            viewer_imgs = {
                 Path(i.name).stem
                 for i in self.viewer.layers
                 if isinstance(i, Image)
-            ]
+            }
             imgs_to_load = [
                 v
                 for k, v in self.image_path_dict.items()
@@ -204,11 +213,13 @@ Images can also be opened, or dragged into napari as normal. The selection will
             ]
         # If giving paths, double-check they aren't already loaded somehow
         elif imgs_to_load:
-            remove_fnames = []
-            for fname in imgs_to_load:
-                if Path(fname).stem in self.viewer.layers:
-                    remove_fnames.append(fname)
-            imgs_to_load = [i for i in imgs_to_load if i not in remove_fnames]
+            # Get the layer names once rather than searching the layer list per file
+            layer_names = {layer.name for layer in self.viewer.layers}
+            imgs_to_load = [
+                fname
+                for fname in imgs_to_load
+                if Path(fname).stem not in layer_names
+            ]
         # Selecting no images will cause imgs_to_load=False, I think?
         else:
             return
@@ -216,20 +227,35 @@ Images can also be opened, or dragged into napari as normal. The selection will
             return
         # Reset counter
         self.load_img_counter = 0
+        self.num_failed_loads = 0
 
-        # Create separate thread worker to avoid blocking
+        # Create a single thread worker to avoid blocking, which yields each image as it loads
         @thread_worker(
             connect={
-                "returned": self._add_image,
+                "yielded": self._add_image,
                 "finished": self._finished_loading,
             }
         )
-        def _load_image(fpath):
-            return skimage.io.imread(fpath), Path(fpath)
+        def _load_images(fpaths):
+            # Bound the number of concurrent reads, rather than a thread per image
+            with ThreadPoolExecutor(
+                max_workers=min(8, len(fpaths))
+            ) as executor:
+                futures = {
+                    executor.submit(read_image, fpath): fpath
+                    for fpath in fpaths
+                }
+                for future in as_completed(futures):
+                    fpath = Path(futures[future])
+                    # Don't let one unreadable file stop the rest from loading
+                    try:
+                        img, err = future.result(), None
+                    except Exception as e:
+                        img, err = None, e
+                    yield img, fpath, err
 
-        # Load each image in a separate thread
-        for fpath in imgs_to_load:
-            _load_image(fpath)
+        # Load the images in a bounded pool within the worker
+        _load_images(imgs_to_load)
         # NOTE: This does not work well for a directory of large images on a remote directory
         # But that would trigger loading GBs into memory over network, which is...undesirable
         self.loading_txt = f" (loading {len(imgs_to_load)} image{'s' if len(imgs_to_load) > 1 else ''}...)"
@@ -239,13 +265,25 @@ Images can also be opened, or dragged into napari as normal. The selection will
         """
         Adds an image to the viewer when loaded, using its filepath as the name.
         """
-        img, fpath = res
+        img, fpath, err = res
+        # Skip any file that couldn't be read, and drop it from the selection
+        if err is not None:
+            show_info(f"Could not load {fpath} ({err}), skipping.")
+            if self.image_path_dict.get(fpath.stem) == fpath:
+                del self.image_path_dict[fpath.stem]
+                # Counts are refreshed once loading finishes, to keep the loading message
+                self.num_failed_loads += 1
+            return
         # Add the image to the overall dict
         self.image_path_dict[fpath.stem] = fpath
         self.viewer.add_image(img, name=fpath.stem)
 
     def _finished_loading(self):
         """Signify to user that all images have been loaded."""
+        # Remove any files that couldn't be loaded from the counts
+        if self.num_failed_loads > 0:
+            self.update_file_count()
+            self.img_counts.setText(self.img_counts.text() + self.loading_txt)
         self.img_counts.setText(
             self.img_counts.text().replace(
                 self.loading_txt, " (all images loaded)."
@@ -263,8 +301,6 @@ Images can also be opened, or dragged into napari as normal. The selection will
         Identify all the files in a given path, and return a count
         (broken down by extension)
         """
-        # Reinitialise text
-        txt = "Selected "
         # Add paths to the overall list if specific ones need adding
         if paths is not None:
             for img_path in paths:
@@ -274,23 +310,24 @@ Images can also be opened, or dragged into napari as normal. The selection will
         if len(self.image_path_dict) == 0:
             self.img_counts.setText(self.init_file_msg)
             return
-        # Get all the extensions in the path
+        # Get all the extensions in the path, streamed without an intermediate list
         extension_counts = Counter(
-            [i.suffix for i in self.image_path_dict.values()]
+            i.suffix for i in self.image_path_dict.values()
         )
-        # Sort by highest and get the suffixes and their counts
-        ext_counts = extension_counts.most_common()
-        if len(ext_counts) > 1:
-            # Nicely format the list of files and their extensions
-            for i, (ext, count) in enumerate(ext_counts):
-                if i == (len(ext_counts) - 1):
-                    txt += f"and {count} {ext}"
-                else:
-                    txt += f"{count} {ext}, "
+        # Sort by highest and format the suffixes and their counts
+        parts = [
+            f"{count} {ext or '(no extension)'}"
+            for ext, count in extension_counts.most_common()
+        ]
+        # Nicely format the list of files and their extensions
+        if len(parts) > 1:
+            counts_txt = ", ".join(parts[:-1]) + f", and {parts[-1]}"
         else:
-            txt += f"{ext_counts[0][1]} {ext_counts[0][0]}"
-        txt += f" file{'s' if sum(extension_counts.values()) > 1 else ''}"
-        self.img_counts.setText(txt)
+            counts_txt = parts[0]
+        num_files = len(self.image_path_dict)
+        self.img_counts.setText(
+            f"Selected {counts_txt} file{'s' if num_files > 1 else ''}"
+        )
 
     def clear_directory(self):
         """
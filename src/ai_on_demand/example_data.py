@@ -1,8 +1,7 @@
 from napari.utils.notifications import show_info
-import requests
-from skimage.io import imread
+import tifffile
 
-from ai_on_demand.utils import get_plugin_cache
+from ai_on_demand.utils import get_plugin_cache, download_from_url
 
 
 def load_example_data():
@@ -13,21 +12,17 @@ def load_example_data():
     if not example_data_path.exists():
         # Download the example data
         try:
-            req = requests.get(
+            download_from_url(
                 "https://zenodo.org/records/7936982/files/em_20nm_z_40_145.tif",
-                stream=True,
+                example_data_path,
             )
-            req.raise_for_status()
-            with open(example_data_path, "wb") as f:
-                for chunk in req.iter_content(chunk_size=8192):
-                    f.write(chunk)
         except:
             show_info(
                 f"Failed to download example data to {example_data_path}. May be due to insufficient permissions, space, or network issues. Please try again later."
             )
             return
     # Load the example data
-    img = imread(example_data_path, plugin="tifffile")
+    img = tifffile.imread(example_data_path)
     # https://github.com/krentzd/napari-clemreg/blob/main/napari_clemreg/clemreg/sample_data.py#L24
     metadata = {
         "ImageDescription": "\nunit=micron\nspacing=0.02\n",
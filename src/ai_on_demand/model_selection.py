@@ -15,7 +15,6 @@ from qtpy.QtWidgets import (
     QComboBox,
     QCheckBox,
 )
-import yaml
 
 from ai_on_demand.widget_classes import SubWidget
 from ai_on_demand.utils import (
@@ -24,6 +23,7 @@ from ai_on_demand.utils import (
     merge_dicts,
     get_param_hash,
     load_config,
+    dump_yaml,
 )
 
 
@@ -51,13 +51,6 @@ Select the model and model variant to use for inference.
 Parameters can be modified if setup properly, otherwise a config file can be loaded in whatever format the model takes!
         """,
         )
-        # Extract the model info from all manifests
-        self.extract_model_info()
-
-        # Track whether the model defaults have been changed
-        self.changed_defaults = False
-
-    def extract_model_info(self):
         # Initialise model-related attributes
         # Easy access to the display name for each model
         self.base_to_display = {}
@@ -66,7 +59,14 @@ Parameters can be modified if setup properly, otherwise a config file can be loa
         self.versions_per_task = {}
         # Dict of model params for each model version, specific to each task
         self.model_version_tasks = {}
+        # The model info is only extracted once a task is first selected
+        # This avoids loading all the manifests while the widget is being built
+        self.model_info_extracted = False
+
+        # Track whether the model defaults have been changed
+        self.changed_defaults = False
 
+    def extract_model_info(self):
         # Extract the model info from all manifests
         for model_manifest in self.parent.all_manifests:
             # Get the short and display names
@@ -91,6 +91,7 @@ Parameters can be modified if setup properly, otherwise a config file can be loa
                     self.model_version_tasks[
                         (task_name, base_name, version_name)
                     ] = task
+        self.model_info_extracted = True
 
     def create_box(self, variant: Optional[str] = None):
         # TODO: This will have to become a variant for e.g. fine-tuning
@@ -135,6 +136,10 @@ Parameters can be modified if setup properly, otherwise a config file can be loa
 
         # Create container for switching between setting params and loading config
         self.params_config_widget = QWidget()
+        # Style the checked state once on the container, rather than per button
+        self.params_config_widget.setStyleSheet(
+            f"QPushButton:checked {{background-color: {self.colour_selected}}}"
+        )
         self.params_config_layout = QHBoxLayout()
         # Create button for displaying model param options
         self.model_param_btn = QPushButton("Modify Parameters")
@@ -144,9 +149,6 @@ Parameters can be modified if setup properly, otherwise a config file can be loa
             )
         )
         self.model_param_btn.setCheckable(True)
-        self.model_param_btn.setStyleSheet(
-            f"QPushButton:checked {{background-color: {self.colour_selected}}}"
-        )
         self.model_param_btn.clicked.connect(self.on_click_model_params)
         self.params_config_layout.addWidget(self.model_param_btn)
         # Create button for displaying model config options
@@ -157,9 +159,6 @@ Parameters can be modified if setup properly, otherwise a config file can be loa
             )
         )
         self.model_config_btn.setCheckable(True)
-        self.model_config_btn.setStyleSheet(
-            f"QPushButton:checked {{background-color: {self.colour_selected}}}"
-        )
         self.model_config_btn.clicked.connect(self.on_click_model_config)
         self.params_config_layout.addWidget(self.model_config_btn)
         # Reduce unnecessary margins/spacing
@@ -446,6 +445,9 @@ Parameters can be modified if setup properly, otherwise a config file can be loa
 
     def update_model_box(self, task_name):
         """The model box updates according to what's defined for each task."""
+        # Load the model info on first use
+        if not self.model_info_extracted:
+            self.extract_model_info()
         # Clear and set available models in dropdown
         self.model_dropdown.clear()
         # Check that there is a model available for this task
@@ -544,7 +546,7 @@ Parameters can be modified if setup properly, otherwise a config file can be loa
         )
         # Save the yaml config
         with open(model_config_fpath, "w") as f:
-            yaml.dump(model_dict, f)
+            dump_yaml(model_dict, f)
         return model_config_fpath
 
     def create_config_params(self, task_model_version: Optional[tuple] = None):
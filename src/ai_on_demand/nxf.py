@@ -1,6 +1,9 @@
-from collections import defaultdict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import csv
+from functools import lru_cache
+import os
 from pathlib import Path
-import subprocess
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -9,8 +12,8 @@ import napari
 from napari.qt.threading import thread_worker
 from napari.utils.notifications import show_info
 import numpy as np
-import pandas as pd
 import qtpy.QtCore
+from qtpy.QtCore import QProcess
 from qtpy.QtWidgets import (
     QWidget,
     QLayout,
@@ -26,11 +29,25 @@ from qtpy.QtWidgets import (
     QSpinBox,
     QDoubleSpinBox,
 )
-import skimage.io
+import tifffile
 import tqdm
 from ai_on_demand.utils import sanitise_name, format_tooltip
 from ai_on_demand.widget_classes import SubWidget
 
+# Zarr export is optional, and written against the zarr-2 API (zarr>=3 rejects numcodecs compressors)
+try:
+    import zarr
+    from numcodecs import Blosc
+
+    ZARR_AVAILABLE = int(zarr.__version__.split(".")[0]) < 3
+except ImportError:
+    ZARR_AVAILABLE = False
+
+# Location of the Segment-Flow submodule (i.e. the Nextflow pipeline)
+SEGMENT_FLOW_DIR = Path(__file__).parent / "Segment-Flow"
+# Directory containing the Nextflow execution profiles
+PROFILES_DIR = SEGMENT_FLOW_DIR / "profiles"
+
 # We need to import from the submodule
 # But it's not a package...lots of issues no __init__'ing can fix it seems
 # And I don't want to touch sys.path
@@ -39,8 +56,8 @@ import sys
 
 spec = importlib.util.spec_from_file_location(
     name="create_splits",
-    location=Path(__file__).parent
-    / "Segment-Flow/modules/models/resources/usr/bin/create_splits.py",
+    location=SEGMENT_FLOW_DIR
+    / "modules/models/resources/usr/bin/create_splits.py",
 )
 module = importlib.util.module_from_spec(spec)
 sys.modules["create_splits"] = module
@@ -49,6 +66,16 @@ spec.loader.exec_module(module)
 from create_splits import generate_stack_indices, calc_num_stacks, Stack
 
 
+@lru_cache(maxsize=1)
+def _list_profiles() -> tuple[str, ...]:
+    """
+    Get the (sorted) names of the available Nextflow profiles.
+
+    Cached as these are fixed for a given installation.
+    """
+    return tuple(sorted(i.stem for i in PROFILES_DIR.glob("*.conf")))
+
+
 class NxfWidget(SubWidget):
     _name = "nxf"
 
@@ -167,9 +194,11 @@ The profile determines where the pipeline is run.
         self.nxf_store_dir.mkdir(parents=True, exist_ok=True)
         # Set the base Nextflow command
         # Ensures logs are stored in the right place (must be before run)
-        self.nxf_base_cmd = (
-            f"nextflow -log '{str(self.nxf_base_dir / 'nextflow.log')}' "
-        )
+        self.nxf_base_cmd = [
+            "nextflow",
+            "-log",
+            str(self.nxf_base_dir / "nextflow.log"),
+        ]
         # Path to store the text file containing the image paths
         self.img_list_fpath = self.nxf_store_dir / "all_img_paths.csv"
         # Working directory for Nextflow
@@ -184,10 +213,7 @@ The profile determines where the pipeline is run.
         )
         self.nxf_profile_box = QComboBox()
         # Get the available profiles from config dir
-        config_dir = Path(__file__).parent / "Segment-Flow" / "profiles"
-        avail_confs = [str(i.stem) for i in config_dir.glob("*.conf")]
-        avail_confs.sort()
-        self.nxf_profile_box.addItems(avail_confs)
+        self.nxf_profile_box.addItems(list(_list_profiles()))
         self.layout().addWidget(self.nxf_profile_label, 0, 0)
         self.layout().addWidget(self.nxf_profile_box, 0, 1)
 
@@ -288,6 +314,9 @@ Show/hide advanced options for the Nextflow pipeline. These options define how t
 
         self.export_format_dropdown = QComboBox()
         self.export_format_dropdown.addItems([".npy", ".tiff"])
+        # Only offer Zarr if it can actually be written
+        if ZARR_AVAILABLE:
+            self.export_format_dropdown.addItem(".zarr")
         export_layout.addWidget(self.export_format_dropdown)
 
         self.export_binary_check = QCheckBox("Binarise masks?")
@@ -451,8 +480,8 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
 
         TODO: May be subject to complete rewrite with dask/zarr
         """
-        # Create container for metadata
-        output = defaultdict(list)
+        # Create container for metadata, one row per image
+        rows = []
         # Create container for knowing what images to track progress of
         self.progress_dict = {}
         # Counter for number of substacks (equivalent to number of submitted jobs!)
@@ -485,32 +514,14 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
             width=round(self.overlap_y.value(), 2),
             depth=round(self.overlap_z.value(), 2),
         )
+        layers = self.parent.viewer.layers
         # Extract info from each image
         for img_path in img_paths:
-            # Get the mask layer name
-            layer = self.parent.viewer.layers[img_path.stem]
             # Get the number of slices, channels, height, and width
-            arr = layer.data.squeeze()
-            if layer.rgb:
-                res = arr.shape[:-1]
-                channels = arr.shape[-1]
-            else:
-                res = arr.shape
-                channels = 1
-            if len(res) == 2:
-                num_slices = 1
-                H, W = res
-            elif len(res) == 3:
-                num_slices, H, W = res
-            else:
-                raise ValueError(
-                    f"Unexpected number of dimensions for image {img_path}!"
-                )
-            output["img_path"].append(str(img_path))
-            output["num_slices"].append(num_slices)
-            output["height"].append(H)
-            output["width"].append(W)
-            output["channels"].append(channels)
+            num_slices, H, W, channels = self._get_img_dims(
+                layers[img_path.stem]
+            )
+            rows.append((str(img_path), num_slices, H, W, channels))
             # Initialise the progress dict
             self.progress_dict[img_path.stem] = 0
             # Get the actual stack size
@@ -528,12 +539,43 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
                 eff_shape=eff_shape,
             )
             total_substacks += num_substacks
-        # Convert to a DataFrame and save
-        df = pd.DataFrame(output)
-        df.to_csv(self.img_list_fpath, index=False)
+        # Stream the rows straight to the CSV, no need for an intermediate DataFrame
+        # Write to a temporary file first and then atomically swap it in, so Nextflow never sees a partially-written file
+        tmp_fpath = self.img_list_fpath.with_suffix(".tmp")
+        with open(tmp_fpath, "w", newline="", buffering=1 << 20) as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(
+                ["img_path", "num_slices", "height", "width", "channels"]
+            )
+            writer.writerows(rows)
+        os.replace(tmp_fpath, self.img_list_fpath)
         # Store the total number of jobs
         self.total_substacks = total_substacks
 
+    def _get_img_dims(self, layer) -> tuple[int, int, int, int]:
+        """
+        Get the number of slices, height, width, and channels of an image layer.
+
+        Squeezes the shape rather than the data, so nothing is computed for lazy (e.g. dask) arrays.
+        """
+        shape = tuple(i for i in layer.data.shape if i != 1)
+        if layer.rgb:
+            res = shape[:-1]
+            channels = shape[-1]
+        else:
+            res = shape
+            channels = 1
+        if len(res) == 2:
+            num_slices = 1
+            H, W = res
+        elif len(res) == 3:
+            num_slices, H, W = res
+        else:
+            raise ValueError(
+                f"Unexpected number of dimensions for image {layer.name}!"
+            )
+        return num_slices, H, W, channels
+
     def check_inference(self):
         """
         Checks that all the necessary parameters are set for inference.
@@ -561,7 +603,7 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
         self.parent.executed_model = self.parent.selected_model
         self.parent.executed_variant = self.parent.selected_variant
         # Set the starting Nextflow command
-        nxf_cmd = self.nxf_base_cmd + f"run {self.nxf_repo} -latest"
+        nxf_cmd = self.nxf_base_cmd + ["run", self.nxf_repo, "-latest"]
         # nxf_params can only be given when used standalone, which is rare
         if nxf_params is not None:
             return nxf_cmd, nxf_params  # FIXME: Returns diff number variables
@@ -569,11 +611,13 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
         parent = self.parent
         # Get the model config path
         config_path = parent.subwidgets["model"].get_model_config()
+        # Sanitise the variant name once for use in paths and params
+        variant_name = sanitise_name(parent.executed_variant)
         # Construct the proper mask directory path
         self.mask_dir_path = (
             self.nxf_store_dir
             / f"{parent.executed_model}"
-            / f"{sanitise_name(parent.executed_variant)}_masks"
+            / f"{variant_name}_masks"
         )
         # Construct the params to be given to Nextflow
         nxf_params = {}
@@ -581,7 +625,7 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
         nxf_params["img_dir"] = str(self.img_list_fpath)
         nxf_params["model"] = parent.selected_model
         nxf_params["model_config"] = config_path
-        nxf_params["model_type"] = sanitise_name(parent.executed_variant)
+        nxf_params["model_type"] = variant_name
         nxf_params["task"] = parent.executed_task
         # Extract the model checkpoint location and location type
         model_task = parent.subwidgets["model"].model_version_tasks[
@@ -632,16 +676,31 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
             load_paths = []
             img_paths = self.parent.subwidgets["data"].image_path_dict.values()
             # Delete data in mask layers if present
-            for img_path in img_paths:
-                # Get the mask layer name
-                layer_name = self.parent._get_mask_layer_name(
-                    Path(img_path).stem
+            # Collect the names first to check against the layer list only once
+            layer_names = {layer.name for layer in self.viewer.layers}
+            to_remove = [
+                layer_name
+                for layer_name in (
+                    self.parent._get_mask_layer_name(Path(img_path).stem)
+                    for img_path in img_paths
                 )
-                if layer_name in self.viewer.layers:
-                    self.viewer.layers.remove(layer_name)
+                if layer_name in layer_names
+            ]
+            for layer_name in to_remove:
+                self.viewer.layers.remove(layer_name)
             # Delete current masks
-            for mask_path in self.mask_dir_path.glob("*.npy"):
-                mask_path.unlink()
+            # Uses scandir to avoid creating a Path for every entry
+            if self.mask_dir_path.exists():
+                with os.scandir(self.mask_dir_path) as entries:
+                    mask_fpaths = [
+                        entry.path
+                        for entry in entries
+                        if entry.name.endswith(".npy") and entry.is_file()
+                    ]
+                # Deleting is just waiting on the filesystem, so overlap them
+                # NOTE: Layer removal above must stay on this (Qt) thread
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    list(executor.map(os.unlink, mask_fpaths))
         # Check if we already have all the masks
         else:
             proceed, img_paths, load_paths = self.parent.check_masks()
@@ -705,39 +764,36 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
         self.store_img_paths(img_paths=img_paths)
         # Add custom work directory
         if self.nxf_work_dir is not None:
-            nxf_cmd += f" -w {self.nxf_work_dir}"
+            nxf_cmd += ["-w", str(self.nxf_work_dir)]
         # Add the selected profile to the command
-        nxf_cmd += f" -profile {self.nxf_profile_box.currentText()}"
+        nxf_cmd += ["-profile", self.nxf_profile_box.currentText()]
         # Add postprocessing flag
         if self.postprocess_btn.isChecked():
-            nxf_cmd += " --postprocess"
+            nxf_cmd.append("--postprocess")
         # Add the parameters to the command
-        for param, value in nxf_params.items():
-            nxf_cmd += f" --{param}={value}"
+        nxf_cmd += [
+            f"--{param}={value}" for param, value in nxf_params.items()
+        ]
         # Add the parameter hash to the command
-        nxf_cmd += (
-            f" --param_hash={self.parent.subwidgets['model'].param_hash}"
-        )
-
-        @thread_worker(
-            connect={
-                "started": self._pipeline_start,
-                "returned": self._pipeline_finish,
-                "errored": self._pipeline_fail,
-            }
+        nxf_cmd.append(
+            f"--param_hash={self.parent.subwidgets['model'].param_hash}"
         )
-        def _run_pipeline(nxf_cmd: str):
-            # Run the command
-            self.process = subprocess.Popen(
-                nxf_cmd, shell=True, cwd=Path.home()
-            )
-            self.process.wait()
-            # Check if the process was successful
-            if self.process.returncode != 0:
-                raise RuntimeError
 
+        # Run the command directly (no shell), so it's Nextflow that receives any signals
+        # QProcess notifies us through the event loop when it exits, so no
+        # thread is tied up just waiting on it
+        self.process = QProcess(self)
+        self.process.setWorkingDirectory(str(Path.home()))
+        # Capture Nextflow's output (stdout & stderr) as it is produced
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        self.process.readyReadStandardOutput.connect(self._pipeline_output)
+        # Keep the tail of the output to report if the pipeline fails
+        self.nxf_output = deque(maxlen=20)
+        self.process.started.connect(self._pipeline_start)
+        self.process.finished.connect(self._pipeline_exit)
+        self.process.errorOccurred.connect(self._pipeline_error)
         # Run the pipeline
-        _run_pipeline(nxf_cmd)
+        self.process.start(nxf_cmd[0], nxf_cmd[1:])
 
     def _reset_btns(self):
         """
@@ -783,6 +839,53 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
         # Ensure progress bar is at 100%
         self.pbar.setValue(self.total_substacks)
 
+    def _pipeline_output(self, flush: bool = False):
+        """
+        Echo any new lines of Nextflow output to the terminal as they arrive, keeping the most recent ones.
+
+        Reads only what is available, so never blocks the UI.
+        """
+        while self.process.canReadLine():
+            self._store_output_line(self.process.readLine())
+        # Pick up any final output not terminated by a newline
+        if flush and self.process.bytesAvailable():
+            self._store_output_line(self.process.readAll())
+
+    def _store_output_line(self, line):
+        line = bytes(line).decode(errors="replace").rstrip()
+        print(line)
+        self.nxf_output.append(line)
+
+    def _pipeline_exit(self, exit_code: int, exit_status=QProcess.NormalExit):
+        # NOTE: exit_status has a default as some bindings connect the single-argument finished(int) overload
+        # Make sure all the output has been read
+        self._pipeline_output(flush=True)
+        # Check if the process was successful
+        if exit_status == QProcess.NormalExit and exit_code == 0:
+            self._pipeline_finish()
+        else:
+            last_output = "\n".join(self.nxf_output)
+            self._pipeline_fail(
+                RuntimeError(
+                    f"Nextflow exited with code {exit_code}:\n{last_output}"
+                )
+            )
+        self._release_process()
+
+    def _pipeline_error(self, error):
+        # Other errors (e.g. crashing) are followed by the finished signal
+        # But if it never started there's nothing to reset
+        if error == QProcess.FailedToStart:
+            show_info("Pipeline failed to start! Is Nextflow installed?")
+            print(self.process.errorString())
+            # No finished signal follows, so clean up here
+            self._release_process()
+
+    def _release_process(self):
+        # Let Qt delete the finished process, rather than accumulating them as children of this widget
+        self.process.deleteLater()
+        self.process = None
+
     def _pipeline_fail(self, exc):
         show_info("Pipeline failed! See terminal for details")
         print(exc)
@@ -865,7 +968,9 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
             filter="Numpy files (*.npy)",  # NOTE: Will need to change when moving away from numpy
         )
         for fname in fnames:
-            mask_arr = np.load(fname, allow_pickle=True)
+            # Memory-map (copy-on-write) so napari only pages in what it displays
+            # and any edits to the layer don't touch the file
+            mask_arr = np.load(fname, mmap_mode="c")
             self.viewer.add_labels(
                 mask_arr,
                 name=Path(fname).stem.replace("_all", ""),
@@ -883,46 +988,154 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
         # Extract the data from each of the layers, and save the result in the given folder
         # NOTE: Will also need adjusting for the dask/zarr rewrite
         if self.selected_mask_layers:
-            count = 0
-            for mask_layer in self.selected_mask_layers:
-                # Get the name of the mask layer as root for the filename
-                fname = f"{mask_layer.name}"
-                # Check if we are binarising
-                if self.export_binary_check.isChecked():
-                    mask_data = self._binarise_mask(mask_layer)
-                    fname += "_binarised"
-                else:
-                    mask_data = mask_layer.data
-                # Get the extension & add to fname
-                ext = self.export_format_dropdown.currentText().strip(".")
-                fname += f".{ext}"
-                if ext == "npy":
-                    np.save(
-                        Path(export_dir) / fname,
-                        mask_data,
+            # Read the export options here, as Qt widgets shouldn't be touched from other threads
+            binarise = self.export_binary_check.isChecked()
+            ext = self.export_format_dropdown.currentText().strip(".")
+            # Take a copy in case the selection changes during export
+            mask_layers = list(self.selected_mask_layers)
+
+            # Write in a separate thread to avoid blocking the UI
+            @thread_worker(
+                connect={
+                    "returned": show_info,
+                    "errored": self._export_fail,
+                }
+            )
+            def _export_masks(mask_layers, export_dir: Path):
+                # Zarr puts all masks into a single store, rather than a file per mask
+                if ext == "zarr":
+                    store_path = self._export_zarr(
+                        mask_layers, export_dir, binarise
+                    )
+                    return (
+                        f"Exported {len(mask_layers)} masks to {store_path}!"
                     )
-                elif ext == "tiff":
-                    skimage.io.imsave(
-                        Path(export_dir) / fname,
-                        mask_data,
-                        plugin="tifffile",
+                # Each mask is an independent (I/O-bound) write, so overlap them
+                with ThreadPoolExecutor(
+                    max_workers=min(8, len(mask_layers))
+                ) as executor:
+                    fpaths = list(
+                        executor.map(
+                            lambda mask_layer: self._export_mask(
+                                mask_layer, export_dir, ext, binarise
+                            ),
+                            mask_layers,
+                        )
                     )
-                count += 1
-            show_info(f"Exported {count} mask files to {export_dir}!")
+                return f"Exported {len(fpaths)} mask files to {export_dir}!"
+
+            _export_masks(mask_layers, Path(export_dir))
         else:
             show_info("No mask layers found!")
 
+    def _export_fail(self, exc):
+        show_info(f"Exporting masks failed! {exc}")
+        print(exc)
+
+    def _export_zarr(
+        self, mask_layers, export_dir: Path, binarise: bool
+    ) -> Path:
+        """
+        Saves the given mask layers as arrays in a single (compressed) Zarr store in the export directory.
+        """
+        store_path = export_dir / "masks.zarr"
+        group = zarr.open_group(str(store_path), mode="a")
+        # Labels are low-entropy, so even light compression gets a large reduction
+        compressor = Blosc(cname="zstd", clevel=1, shuffle=Blosc.BITSHUFFLE)
+        for mask_layer in mask_layers:
+            name = mask_layer.name
+            if binarise:
+                mask_data = self._binarise_mask(mask_layer)
+                name += "_binarised"
+            else:
+                mask_data = np.asarray(mask_layer.data)
+            # Chunk by slice for stacks
+            chunks = (1,) * (mask_data.ndim - 2) + (512, 512)
+            group.create_dataset(
+                name,
+                data=mask_data,
+                chunks=chunks,
+                compressor=compressor,
+                overwrite=True,
+            )
+        return store_path
+
+    def _export_mask(
+        self, mask_layer, export_dir: Path, ext: str, binarise: bool
+    ) -> Path:
+        """
+        Saves the data of the given mask layer into the export directory.
+        """
+        # Get the name of the mask layer as root for the filename
+        fname = f"{mask_layer.name}"
+        # Check if we are binarising
+        if binarise:
+            fname += "_binarised"
+        # Add the extension to fname
+        fpath = export_dir / f"{fname}.{ext}"
+        if ext == "npy":
+            # Binarising is done as it's written, to avoid a full-size copy
+            self._save_npy(fpath, mask_layer.data, binarise=binarise)
+        elif ext == "tiff":
+            tifffile.imwrite(
+                fpath,
+                (
+                    self._binarise_mask(mask_layer)
+                    if binarise
+                    else mask_layer.data
+                ),
+            )
+        return fpath
+
     def cancel_pipeline(self):
         # Trigger Nextflow to cancel the pipeline
-        self.process.send_signal(subprocess.signal.SIGTERM)
+        if self.process is not None:
+            self.process.terminate()
         # Reset the progress bar
         self.reset_progress_bar()
 
+    def _save_npy(
+        self,
+        fpath: Path,
+        arr,
+        binarise: bool = False,
+        slab_bytes: int = 64 << 20,
+    ):
+        """
+        Saves the given array as a .npy file, optionally binarising it.
+
+        Large arrays are written through a memory-mapped file in slabs (along the first axis) of roughly `slab_bytes`, so lazy/memory-mapped data is never fully materialised in memory at once, and binarising never needs a full-size copy.
+        """
+        if arr.ndim == 0 or arr.nbytes <= slab_bytes:
+            np.save(fpath, self._binarise(arr) if binarise else arr)
+            return
+        out = np.lib.format.open_memmap(
+            fpath,
+            mode="w+",
+            dtype=np.uint8 if binarise else arr.dtype,
+            shape=arr.shape,
+        )
+        step = max(1, slab_bytes // (arr.nbytes // arr.shape[0]))
+        for i in range(0, arr.shape[0], step):
+            slab = np.asarray(arr[i : i + step])
+            out[i : i + step] = self._binarise(slab) if binarise else slab
+        out.flush()
+        del out
+
+    def _binarise(self, arr):
+        """
+        Binarises the given array (0 background, 255 foreground) as uint8.
+        """
+        # Reinterpret the bool result as uint8 and scale in-place, avoiding extra temporaries
+        binary = np.not_equal(arr, 0).view(np.uint8)
+        binary *= 255
+        return binary
+
     def _binarise_mask(self, mask_layer):
         """
         Binarises the given mask layer.
         """
-        return (mask_layer.data).astype(bool).astype(np.uint8) * 255
+        return self._binarise(np.asarray(mask_layer.data))
 
     def update_tile_size(self):
         """
@@ -973,10 +1186,12 @@ Threshold for the Intersection over Union (IoU) metric used in the SAM post-proc
             self.tile_size_label.setText("No image layers found!")
             return
         # Otherwise just take the first one
-        img_shape = layers[0].data.shape
-        img_shape = Stack(
-            height=img_shape[1], width=img_shape[2], depth=img_shape[0]
-        )
+        try:
+            num_slices, H, W, _ = self._get_img_dims(layers[0])
+        except ValueError:
+            self.tile_size_label.setText("Unsupported image dimensions!")
+            return
+        img_shape = Stack(height=H, width=W, depth=num_slices)
         # Get the actual stack size
         num_substacks, eff_shape = calc_num_stacks(
             image_shape=img_shape,
@@ -43,6 +43,10 @@ class TaskWidget(SubWidget):
             btn.clicked.connect(self.on_click_task)
             self.layout().addWidget(btn)
             self.task_buttons[name] = btn
+        # Reverse lookup to get the task from the clicked button
+        self.button_tasks = {
+            btn: name for name, btn in self.task_buttons.items()
+        }
 
         self.widget.setLayout(self.layout())
 
@@ -53,9 +57,7 @@ class TaskWidget(SubWidget):
         Updates the model box to show only the models available for the selected task.
         """
         # Find out which button was pressed
-        for task_name, task_btn in self.task_buttons.items():
-            if task_btn.isChecked():
-                self.parent.selected_task = task_name
+        self.parent.selected_task = self.button_tasks[self.sender()]
         # Update the model box for the selected task
         self.parent.subwidgets["model"].update_model_box(
             self.parent.selected_task
@@ -1,45 +1,69 @@
+from functools import lru_cache
 import hashlib
+import imageio.v3 as iio
 import json
 from napari.layers import Image
 from napari.utils.notifications import show_info
+import os
 from pathlib import Path
+import shutil
 import textwrap
-from typing import Optional
+import tifffile
+from typing import Optional, Union
 import yaml
 
 from platformdirs import user_cache_dir
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Use libyaml's C emitter where available, it's much faster than pure Python
+try:
+    from yaml import CSafeDumper as _YAMLDumper
+except ImportError:
+    from yaml import SafeDumper as _YAMLDumper
+
+
+# Translation table for characters to replace when sanitising names
+_SANITISE_TABLE = str.maketrans({" ": "-"})
 
 
 def sanitise_name(name):
     """
     Function to sanitise model/model variant names to use in filenames (in Nextflow).
     """
-    return name.replace(" ", "-")
+    return name.translate(_SANITISE_TABLE)
 
 
 def merge_dicts(d1: dict, d2: Optional[dict] = None) -> dict:
     """
-    Merge two dictionaries recursively. d2 will overwrite d1 where specified.
+    Merge two dictionaries recursively (in-place into d1). d2 will overwrite d1 where specified.
 
-    Assumes both dicts have same structure/keys.
+    Nested dicts are merged where both have them, anything else in d2 (including keys missing from d1) replaces what is in d1.
     """
     # Short-circuit if d2 is None
     if d2 is None:
         return d1
-    # Otherwise recursively merge
-    for k, v in d2.items():
-        if isinstance(v, dict):
-            d1[k] = merge_dicts(d1[k], v)
-        else:
-            d1[k] = v
+    # Walk the nested dicts with an explicit stack rather than recursing
+    stack = [(d1, d2)]
+    while stack:
+        base, new = stack.pop()
+        for k, v in new.items():
+            if isinstance(v, dict) and isinstance(base.get(k), dict):
+                stack.append((base[k], v))
+            else:
+                base[k] = v
     return d1
 
 
+@lru_cache(maxsize=512)
 def format_tooltip(text, width: int = 70):
     """
     Function to wrap text in a tooltip to the specified width. Ensures better-looking tooltips.
 
     Necessary because Qt only automatically wordwraps rich text, which has it's own issues.
+
+    Cached as tooltips are (almost always) static strings that are re-wrapped every time a widget is created.
     """
     return textwrap.fill(text.strip(), width=width, drop_whitespace=True)
 
@@ -78,6 +102,13 @@ def load_config(config_path):
     return model_dict
 
 
+def dump_yaml(data, f):
+    """
+    Dumps the given data as YAML to the given (open) file, using the fastest available dumper.
+    """
+    yaml.dump(data, f, Dumper=_YAMLDumper)
+
+
 def get_plugin_cache() -> tuple[Path, Path]:
     cache_dir = Path(user_cache_dir("aiod"))
     cache_dir.mkdir(parents=True, exist_ok=True)
@@ -96,6 +127,68 @@ def load_settings():
     return settings
 
 
+# Shared session so repeated requests to the same host reuse connections
+# With retries for flaky connections
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+        ),
+    ),
+)
+
+
+def _download_stream(url: str, fpath: Path):
+    """
+    Download the file at the given URL over a single connection.
+
+    If the file already partially exists, the download is resumed from where it stopped (if the server allows it).
+    """
+    # Resume from wherever a previous attempt got to
+    start = fpath.stat().st_size if fpath.exists() else 0
+    headers = (
+        {"Range": f"bytes={start}-", "Accept-Encoding": "identity"}
+        if start
+        else {}
+    )
+    req = _session.get(url, stream=True, headers=headers)
+    # Partial file is already full-size (e.g. interrupted before being moved into place)
+    # So we can't trust it and need to start again
+    if req.status_code == 416:
+        req.close()
+        start = 0
+        req = _session.get(url, stream=True)
+    with req:
+        req.raise_for_status()
+        # Only append if the server actually honoured the range
+        resume = start > 0 and req.status_code == 206
+        # Ensure any gzip/deflate transfer-encoding is undone when reading raw
+        req.raw.decode_content = True
+        # Stream straight from the socket to disk in large blocks, avoiding
+        # Python-level iteration over each chunk
+        with open(fpath, "ab" if resume else "wb", buffering=1 << 20) as f:
+            shutil.copyfileobj(req.raw, f, length=1 << 20)
+
+
+def download_from_url(url: str, fpath: Union[str, Path]) -> Path:
+    """
+    Download the file at the given URL to the given filepath.
+
+    The download goes to a ".part" file that is only moved into place once complete, so an interrupted download is resumed on the next call rather than started from scratch (or mistaken for a complete file).
+
+    Raises any HTTP errors encountered, leaving it to the caller to notify the user.
+    """
+    fpath = Path(fpath)
+    part_fpath = fpath.with_name(f"{fpath.name}.part")
+    _download_stream(url, part_fpath)
+    os.replace(part_fpath, fpath)
+    return fpath
+
+
 def get_image_layer_path(
     img_layer: Image, image_path_dict: Optional[dict] = None
 ) -> Path:
@@ -118,3 +211,18 @@ def get_image_layer_path(
                 return
     else:
         return Path(img_path)
+
+
+# Readers to use for each image suffix, falling back to imageio for anything else
+# Using these directly avoids skimage.io's plugin dispatch (and its import cost)
+_IMAGE_READERS = {
+    ".tif": tifffile.imread,
+    ".tiff": tifffile.imread,
+}
+
+
+def read_image(fpath: Union[str, Path]):
+    """
+    Reads an image from the given path, using tifffile for TIFFs and imageio for everything else.
+    """
+    return _IMAGE_READERS.get(Path(fpath).suffix.lower(), iio.imread)(fpath)
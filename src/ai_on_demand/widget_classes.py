@@ -1,8 +1,8 @@
 from abc import abstractmethod
+from functools import cached_property
 from pathlib import Path
 import string
 from typing import Optional
-import yaml
 
 import napari
 from npe2 import PluginManager
@@ -23,10 +23,14 @@ from ai_on_demand.utils import (
     load_settings,
     get_plugin_cache,
     merge_dicts,
+    dump_yaml,
 )
 
 
 class MainWidget(QWidget):
+    # Scaled logo, shared across all instances
+    _logo: Optional[QPixmap] = None
+
     def __init__(
         self,
         napari_viewer: napari.Viewer,
@@ -34,9 +38,6 @@ class MainWidget(QWidget):
         tooltip: Optional[str] = None,
     ):
         super().__init__()
-        pm = PluginManager.instance()
-        self.all_manifests = pm.commands.execute("ai-on-demand.get_manifests")
-        self.plugin_settings = pm.commands.execute("ai-on-demand.get_settings")
 
         self.viewer = napari_viewer
         self.scroll = QScrollArea()
@@ -49,14 +50,7 @@ class MainWidget(QWidget):
 
         # Add a Crick logo to the widget
         self.logo_label = QLabel()
-        logo = QPixmap(
-            str(
-                Path(__file__).parent
-                / "resources"
-                / "CRICK_Brandmark_01_transparent.png"
-            )
-        ).scaledToHeight(100, mode=qtpy.QtCore.Qt.SmoothTransformation)
-        self.logo_label.setPixmap(logo)
+        self.logo_label.setPixmap(self.get_logo())
         self.logo_label.setAlignment(qtpy.QtCore.Qt.AlignCenter)
         self.layout().addWidget(self.logo_label)
 
@@ -85,6 +79,39 @@ class MainWidget(QWidget):
         self.scroll.setWidget(self.content_widget)
         self.layout().addWidget(self.scroll)
 
+    @cached_property
+    def all_manifests(self):
+        """
+        Manifests for all available models, loaded on first use.
+        """
+        return PluginManager.instance().commands.execute(
+            "ai-on-demand.get_manifests"
+        )
+
+    @cached_property
+    def plugin_settings(self):
+        """
+        Stored plugin settings, loaded on first use.
+        """
+        return PluginManager.instance().commands.execute(
+            "ai-on-demand.get_settings"
+        )
+
+    @staticmethod
+    def get_logo() -> QPixmap:
+        """
+        Get the scaled Crick logo, loading and resampling it only the first time.
+        """
+        if MainWidget._logo is None:
+            MainWidget._logo = QPixmap(
+                str(
+                    Path(__file__).parent
+                    / "resources"
+                    / "CRICK_Brandmark_01_transparent.png"
+                )
+            ).scaledToHeight(100, mode=qtpy.QtCore.Qt.SmoothTransformation)
+        return MainWidget._logo
+
     def register_widget(self, widget: "SubWidget"):
         self.subwidgets[widget._name] = widget
 
@@ -96,19 +123,13 @@ class MainWidget(QWidget):
 
         # Load the existing saved settings
         orig_settings = load_settings()
-        # Merge the current settings
-        # Try to do a nuanced merge at first
-        try:
-            plugin_settings = merge_dicts(orig_settings, self.plugin_settings)
-        except KeyError:
-            # If this fails, our schema has changed and we need to overwrite the settings
-            # Try to preserve original where possible
-            # TODO: Future, embed versioning in the settings
-            plugin_settings = {**orig_settings, **self.plugin_settings}
+        # Merge the current settings, preserving the original where possible
+        # TODO: Future, embed versioning in the settings
+        plugin_settings = merge_dicts(orig_settings, self.plugin_settings)
         # Save the settings to the cache
         _, settings_path = get_plugin_cache()
         with open(settings_path, "w") as f:
-            yaml.dump(plugin_settings, f)
+            dump_yaml(plugin_settings, f)
 
 
 class SubWidget(QWidget):